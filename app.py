@@ -2,6 +2,7 @@ import streamlit as st
 from files_reader_chunker import DocumentProcessor
 from vector_database import PineconeDB
 from rag_pipeline import RAG
+from pipeline_metrics import metrics
 import os
 
 # Configure Streamlit page
@@ -78,6 +79,16 @@ if prompt := st.chat_input("What kind of candidate are you looking for?"):
     # Add assistant response to chat history
     st.session_state.messages.append({"role": "assistant", "content": response})
 
+# Stage timings collected since the app started
+with st.expander("⏱ Pipeline timings"):
+    st.code(metrics.to_json(), language="json")
+    st.download_button(
+        "Download Prometheus metrics",
+        metrics.to_prometheus(),
+        file_name="pipeline_metrics.prom",
+        mime="text/plain",
+    )
+
 # Add some helpful information at the bottom
 with st.expander("💡 Tips for better results"):
     st.write("""
@@ -0,0 +1,262 @@
+"""
+Offline benchmark for the ingestion and query pipelines.
+
+Replays the CV corpora saved in Experiments/cv_chunks_*.json through the
+clean -> chunk -> embed -> upsert path and a set of canned job queries through
+the RAG chain, using an in-memory vector store, hashed embeddings and a fake
+streaming LLM so no Pinecone, HuggingFace or Groq access is needed.
+The corpora are already extracted text, so the extract stage is not exercised.
+
+Usage:
+    python benchmark.py --repeats 5 --output bench.json --prometheus bench.prom
+"""
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from files_reader_chunker import DocumentProcessor
+from pipeline_metrics import QUERY_STAGES, STAGES, metrics, percentile
+from rag_pipeline import RAG
+from vector_database import PineconeDB
+
+DEFAULT_CORPORA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "Experiments", "cv_chunks_*.json")
+
+CANNED_QUERIES = [
+    "Looking for a machine learning engineer with Python and PyTorch experience",
+    "Data scientist with 3+ years of experience in forecasting and SQL",
+    "Backend developer skilled in Flask, Docker and cloud deployment",
+    "Computer vision engineer with OpenCV and deep learning background",
+    "NLP engineer who has built RAG chatbots with LangChain",
+    "Data analyst with Power BI dashboards and Excel reporting",
+    "MLOps engineer familiar with CI/CD, Kubernetes and model monitoring",
+    "Fresh graduate in computer science with strong problem solving skills",
+    "Candidate with GCP BigQuery data warehousing experience",
+    "Software engineer with Java, Spring Boot and microservices",
+]
+
+CANNED_ANSWER = (
+    "1- Score: 8/10\n"
+    "2- Candidate full name: Benchmark Candidate\n"
+    "3- Values: Python, machine learning, cloud deployment\n"
+    "4- Analysis: The candidate's experience matches the core requirements "
+    "of the position based on the retrieved CV sections."
+)
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic bag-of-words hashing embeddings, no model download needed"""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # SentenceTransformer-style interface used by PineconeDB
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self._embed(t) for t in texts])
+
+    # LangChain Embeddings interface used by the vector store
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text).tolist()
+
+
+class LocalIndex:
+    """
+    Pinecone-style index writing into a LangChain in-memory vector store.
+    Records are written in the store's internal layout to avoid embedding
+    every chunk twice, check_retrieval() catches a layout change.
+    """
+
+    def __init__(self, vector_store: InMemoryVectorStore, text_key="content"):
+        self.vector_store = vector_store
+        self.text_key = text_key
+
+    def upsert(self, vectors):
+        for vector_id, values, metadata in vectors:
+            metadata = dict(metadata)
+            text = metadata.pop(self.text_key)
+            self.vector_store.store[vector_id] = {
+                "id": vector_id,
+                "vector": values,
+                "text": text,
+                "metadata": metadata,
+            }
+
+
+class FakeStreamingChatModel(FakeListChatModel):
+    """Fake chat model that streams through the callbacks like ChatGroq does"""
+
+    def _should_stream(self, *, async_api, run_manager=None, **kwargs) -> bool:
+        # FakeListChatModel streams one character at a time, sleeping
+        # `sleep` seconds before each, so first-token timings are recorded
+        return True
+
+
+def check_retrieval(vector_store: InMemoryVectorStore, documents: List[Tuple[str, str]]):
+    """Fail loudly if the ingested chunks cannot be retrieved back"""
+    docs = vector_store.similarity_search(documents[0][1], k=1)
+    if not docs or not docs[0].page_content:
+        sys.exit("Retrieval check failed: the in-memory vector store returned no "
+                 "content, its record layout may have changed")
+
+
+def load_corpora(pattern: str) -> List[Tuple[str, str]]:
+    """
+    Rebuild one (file name, text) document per CV from the saved chunk files.
+    The exports hold the same CVs in different formats, so a CV already
+    loaded from an earlier file is skipped.
+    """
+    documents: Dict[str, str] = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            chunks = json.load(f)
+        parts: Dict[str, List[str]] = {}
+        for chunk in chunks:
+            # Older exports keep the source under metadata, newer ones inline
+            if "metadata" in chunk:
+                file_name = chunk["metadata"]["file_name"]
+            else:
+                file_name = chunk["original_file"]
+            parts.setdefault(file_name, []).append(chunk["content"])
+        for name, texts in parts.items():
+            documents.setdefault(name, "\n\n".join(texts))
+    return list(documents.items())
+
+
+def run_ingestion(documents: List[Tuple[str, str]], vector_db: PineconeDB,
+                  processor: DocumentProcessor, repeats: int) -> Dict:
+    total_chunks = 0
+    total_chars = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for file_name, text in documents:
+            cleaned_text = processor.clean_text(text)
+            chunks = processor.create_chunks(cleaned_text, {"file_name": file_name})
+            with contextlib.redirect_stdout(io.StringIO()):
+                vector_db.upload_chunks_to_pinecone(chunks, show_progress=False)
+            total_chunks += len(chunks)
+            total_chars += len(text)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "unique_documents": len(documents),
+        "documents": len(documents) * repeats,
+        "chunks": total_chunks,
+        "characters": total_chars,
+        "seconds": elapsed,
+        "documents_per_second": len(documents) * repeats / elapsed if elapsed else 0.0,
+        "chunks_per_second": total_chunks / elapsed if elapsed else 0.0,
+        "characters_per_second": total_chars / elapsed if elapsed else 0.0,
+    }
+
+
+def run_query(rag: RAG, query: str) -> float:
+    # Each query starts from an empty history so runs are comparable
+    rag.mem_buff.clear()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rag.get_response(query)
+    return time.perf_counter() - start
+
+
+def run_queries(rag: RAG, queries: List[str], repeats: int, warmup: int) -> Dict:
+    for i in range(warmup):
+        run_query(rag, queries[i % len(queries)])
+    # Warmup timings would skew the tail of the query stages
+    metrics.reset(stages=QUERY_STAGES)
+
+    latencies = [run_query(rag, query) for _ in range(repeats) for query in queries]
+
+    return {
+        "queries": len(latencies),
+        "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ingestion and query benchmark")
+    parser.add_argument("--corpora", default=DEFAULT_CORPORA,
+                        help="Glob of cv_chunks JSON files to replay")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="How many times to replay the corpora and the query set")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="Queries run before latencies are recorded")
+    parser.add_argument("--llm-delay", type=float, default=0.0,
+                        help="Seconds the fake LLM sleeps per streamed character")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--prometheus", help="Write stage timings in Prometheus text format to this file")
+    args = parser.parse_args()
+
+    documents = load_corpora(args.corpora)
+    if not documents:
+        parser.error(f"No corpora found matching {args.corpora}")
+
+    metrics.reset()
+
+    embeddings = HashEmbeddings()
+    vector_store = InMemoryVectorStore(embedding=embeddings)
+    vector_db = PineconeDB(index=LocalIndex(vector_store), model=embeddings)
+    processor = DocumentProcessor()
+    # Per-document INFO logs would dominate the timings of small chunks
+    processor.logger.setLevel(logging.WARNING)
+    ingestion = run_ingestion(documents, vector_db, processor, args.repeats)
+    check_retrieval(vector_store, documents)
+
+    llm = FakeStreamingChatModel(
+        responses=[CANNED_ANSWER],
+        sleep=args.llm_delay or None,
+    )
+    rag = RAG(vector_db=vector_store, llm=llm)
+    queries = run_queries(rag, CANNED_QUERIES, args.repeats, args.warmup)
+
+    report = {
+        "ingestion": ingestion,
+        "query_latency_seconds": queries,
+        "stage_timings": json.loads(metrics.to_json()),
+    }
+    report_json = json.dumps(report, indent=2)
+    print(report_json)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report_json)
+    if args.prometheus:
+        with open(args.prometheus, "w", encoding="utf-8") as f:
+            f.write(metrics.to_prometheus())
+
+    # Extract is never exercised since the corpora are already text
+    recorded = report["stage_timings"]["stages"]
+    missing = [s for s in STAGES if s != "extract" and s not in recorded]
+    if missing:
+        sys.exit(f"Stages missing from the report: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 from files_reader_chunker import DocumentProcessor
 from vector_database import PineconeDB
+from pipeline_metrics import metrics
 
 input_folder = "CVs"
 processor = DocumentProcessor()
 chunks = processor.process_folder(input_folder)
 
 vector_databases = PineconeDB()
-vector_databases.upload_chunks_to_pinecone(chunks)
\ No newline at end of file
+vector_databases.upload_chunks_to_pinecone(chunks)
+
+# Export the ingestion stage timings
+with open("pipeline_metrics.json", "w", encoding="utf-8") as f:
+    f.write(metrics.to_json())
+with open("pipeline_metrics.prom", "w", encoding="utf-8") as f:
+    f.write(metrics.to_prometheus())
+print("Stage timings written to pipeline_metrics.json and pipeline_metrics.prom")
@@ -5,6 +5,7 @@ from tqdm import tqdm
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from typing import List, Dict
 import os
+from pipeline_metrics import metrics
 
 class DocumentProcessor:
     def __init__(
@@ -28,6 +29,7 @@ class DocumentProcessor:
             separators=["\n\n", "\n", ". ", " ", ""]
         )
 
+    @metrics.timed("extract")
     def extract_from_docx(self, docx_path: str) -> str:
         """Extract text from DOCX using python-docx only"""
         try:
@@ -60,6 +62,7 @@ class DocumentProcessor:
             self.logger.error(f"Error processing DOCX {docx_path}: {str(e)}")
             return ""
 
+    @metrics.timed("extract")
     def extract_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF using pdfplumber"""
         try:
@@ -77,6 +80,7 @@ class DocumentProcessor:
             self.logger.error(f"Error processing PDF {pdf_path}: {str(e)}")
             return ""
 
+    @metrics.timed("clean")
     def clean_text(self, text: str) -> str:
         if not text:
             return ""
@@ -95,6 +99,7 @@ class DocumentProcessor:
             self.logger.error(f"Error cleaning text: {str(e)}")
             return text
 
+    @metrics.timed("chunk")
     def create_chunks(self, text: str, metadata: Dict) -> List[Dict]:
         try:
             chunks = self.text_splitter.split_text(text)
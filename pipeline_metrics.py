@@ -0,0 +1,146 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List
+
+# Pipeline stages in the order they run for ingestion and querying
+STAGES = (
+    "extract",
+    "clean",
+    "chunk",
+    "embed",
+    "upsert",
+    "precheck",
+    "retrieve",
+    "context_build",
+    "llm_first_token",
+    "llm_total",
+)
+
+# Stages recorded while answering a query
+QUERY_STAGES = ("precheck", "retrieve", "context_build", "llm_first_token", "llm_total")
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-th quantile (0..1) of values using linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[int(position)]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class PipelineMetrics:
+    def __init__(self, max_samples=10000):
+        # Only the most recent samples are kept for quantiles,
+        # count and sum stay exact for the whole process lifetime
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, stages=None):
+        """Drop the recorded samples of the given stages, or of every stage"""
+        with self._lock:
+            if stages is None:
+                self._samples: Dict[str, deque] = {}
+                self._counts: Dict[str, int] = {}
+                self._sums: Dict[str, float] = {}
+                return
+            for stage in stages:
+                self._samples.pop(stage, None)
+                self._counts.pop(stage, None)
+                self._sums.pop(stage, None)
+
+    def observe(self, stage: str, seconds: float):
+        """Record one duration (in seconds) for a stage"""
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.max_samples)
+                self._counts[stage] = 0
+                self._sums[stage] = 0.0
+            self._samples[stage].append(seconds)
+            self._counts[stage] += 1
+            self._sums[stage] += seconds
+
+    @contextmanager
+    def time(self, stage: str):
+        """Context manager timing the enclosed block as one sample of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage: str):
+        """Decorator timing every call of the wrapped function as stage"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def samples(self, stage: str) -> List[float]:
+        with self._lock:
+            return list(self._samples.get(stage, ()))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count, total, mean, min, max and quantiles in seconds"""
+        with self._lock:
+            snapshot = {
+                stage: (list(values), self._counts[stage], self._sums[stage])
+                for stage, values in self._samples.items()
+            }
+
+        # Known stages first in pipeline order, then anything custom
+        ordered = [s for s in STAGES if s in snapshot]
+        ordered += sorted(s for s in snapshot if s not in STAGES)
+
+        result = {}
+        for stage in ordered:
+            values, count, total = snapshot[stage]
+            stats = {
+                "count": count,
+                "total": total,
+                "mean": total / count if count else 0.0,
+                "min": min(values) if values else 0.0,
+                "max": max(values) if values else 0.0,
+            }
+            for q in QUANTILES:
+                stats[f"p{int(q * 100)}"] = percentile(values, q)
+            result[stage] = stats
+        return result
+
+    def to_json(self, indent=2) -> str:
+        """Export the summary as a JSON document"""
+        return json.dumps({"unit": "seconds", "stages": self.summary()}, indent=indent)
+
+    def to_prometheus(self, prefix="cv_rag") -> str:
+        """Export the summary in the Prometheus text exposition format"""
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of each pipeline stage in seconds.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, stats in self.summary().items():
+            for q in QUANTILES:
+                value = stats[f"p{int(q * 100)}"]
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value!r}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["total"]!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide collector shared by the ingestion and query pipelines
+metrics = PipelineMetrics()
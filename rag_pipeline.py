@@ -1,35 +1,88 @@
 import os
+import time
 from langchain_pinecone import Pinecone
 from langchain_groq import ChatGroq
 from langchain.chains import ConversationalRetrievalChain
 from langchain.embeddings import HuggingFaceEmbeddings
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
+from langchain_core.callbacks import BaseCallbackHandler
+from pipeline_metrics import metrics
 
 PINECONE_API_KEY = os.getenv('PINECONE_API_KEY')
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 
+class StageTimingHandler(BaseCallbackHandler):
+    """
+    Callback handler recording retrieve, context build, LLM first token and
+    LLM total timings for a single chain call
+    """
+
+    def __init__(self, stage_metrics=metrics):
+        self.metrics = stage_metrics
+        self.retrieve_started = None
+        self.retrieve_ended = None
+        self.llm_run_id = None
+        self.llm_started = None
+        self.first_token_seen = False
+
+    def on_retriever_start(self, serialized, query, *, run_id, **kwargs):
+        self.retrieve_started = time.perf_counter()
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self.retrieve_ended = time.perf_counter()
+        self.metrics.observe("retrieve", self.retrieve_ended - self.retrieve_started)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._answer_llm_start(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._answer_llm_start(run_id)
+
+    def _answer_llm_start(self, run_id):
+        # Only the LLM call answering from the retrieved documents is timed,
+        # the question condensing call made before retrieval is skipped
+        if self.retrieve_ended is None or self.llm_run_id is not None:
+            return
+        self.llm_run_id = run_id
+        self.llm_started = time.perf_counter()
+        self.metrics.observe("context_build", self.llm_started - self.retrieve_ended)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if run_id == self.llm_run_id and not self.first_token_seen:
+            self.first_token_seen = True
+            self.metrics.observe("llm_first_token", time.perf_counter() - self.llm_started)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        if run_id == self.llm_run_id:
+            self.metrics.observe("llm_total", time.perf_counter() - self.llm_started)
+
+
 class RAG:
     def __init__(self, pc_index="rag-cvs-named", embed_model="BAAI/bge-large-en-v1.5",
-                 llm_model='llama3-70b-8192'):
-        
-        # Initialize embedding model
-        self.embed_model = HuggingFaceEmbeddings(model_name=embed_model)
-
-        # Initialize vector database
-        self.vector_db = Pinecone.from_existing_index(
-            index_name=pc_index,
-            embedding=self.embed_model,
-            text_key="content"
-        )
+                 llm_model='llama3-70b-8192', vector_db=None, llm=None):
 
-        # Initialize LLM
-        self.llm = ChatGroq(
-            groq_api_key=GROQ_API_KEY,
-            model_name=llm_model,
-            temperature=0.0,
-            streaming=True,
-        )
+        if vector_db is None:
+            # Initialize embedding model
+            self.embed_model = HuggingFaceEmbeddings(model_name=embed_model)
+
+            # Initialize vector database
+            vector_db = Pinecone.from_existing_index(
+                index_name=pc_index,
+                embedding=self.embed_model,
+                text_key="content"
+            )
+        self.vector_db = vector_db
+
+        if llm is None:
+            # Initialize LLM
+            llm = ChatGroq(
+                groq_api_key=GROQ_API_KEY,
+                model_name=llm_model,
+                temperature=0.0,
+                streaming=True,
+            )
+        self.llm = llm
 
         # Initialize improved memory with summary buffer
         self.mem_buff = ConversationBufferWindowMemory(
@@ -106,11 +159,12 @@ class RAG:
         Function to get response from the QA chain with debug information
         """
         print("\nRetrieving relevant documents...")
-        docs = self.check_db_content(text)
+        with metrics.time("precheck"):
+            docs = self.check_db_content(text)
         
         if not docs:
             return "No candidates found with these skills. Please provide more skills or a better description."
         
         print("\nGenerating response...")
-        response = self.llm_chain({"question": text})
+        response = self.llm_chain({"question": text}, callbacks=[StageTimingHandler()])
         return response["answer"]
\ No newline at end of file
@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("pinecone")
+pytest.importorskip("sentence_transformers")
+
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from benchmark import (
+    CANNED_ANSWER,
+    DEFAULT_CORPORA,
+    FakeStreamingChatModel,
+    HashEmbeddings,
+    LocalIndex,
+    load_corpora,
+)
+from pipeline_metrics import QUERY_STAGES, metrics
+from rag_pipeline import RAG
+from vector_database import PineconeDB
+
+CV_TEXT = (
+    "Jane Doe machine learning engineer. Experience with Python, PyTorch "
+    "and building RAG chatbots with LangChain and Pinecone."
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def vector_store():
+    embeddings = HashEmbeddings()
+    store = InMemoryVectorStore(embedding=embeddings)
+    vector_db = PineconeDB(index=LocalIndex(store), model=embeddings)
+    vector_db.upload_chunks_to_pinecone(
+        [{"original_file": "Jane Doe", "chunk_id": "Jane Doe_chunk_0", "content": CV_TEXT}],
+        show_progress=False,
+    )
+    return store
+
+
+@pytest.fixture
+def rag(vector_store):
+    return RAG(vector_db=vector_store, llm=FakeStreamingChatModel(responses=[CANNED_ANSWER]))
+
+
+def test_local_index_is_searchable(vector_store):
+    docs = vector_store.similarity_search("PyTorch engineer", k=1)
+    assert docs[0].page_content == CV_TEXT
+    assert docs[0].metadata == {"original_file": "Jane Doe", "chunk_id": "Jane Doe_chunk_0"}
+
+    summary = metrics.summary()
+    assert summary["embed"]["count"] == 1
+    assert summary["upsert"]["count"] == 1
+
+
+def test_query_records_every_query_stage(rag):
+    assert rag.get_response("Python engineer") == CANNED_ANSWER
+
+    summary = metrics.summary()
+    for stage in QUERY_STAGES:
+        assert summary[stage]["count"] == 1, stage
+
+
+def test_question_condensing_call_is_not_timed(rag):
+    rag.get_response("Python engineer")
+    # With history in memory the chain makes an extra LLM call to
+    # rephrase the question before retrieval, only the answer is timed
+    rag.get_response("Any others?")
+
+    summary = metrics.summary()
+    assert summary["llm_first_token"]["count"] == 2
+    assert summary["llm_total"]["count"] == 2
+
+
+def test_load_corpora_deduplicates_exports():
+    documents = load_corpora(DEFAULT_CORPORA)
+    names = [name for name, _ in documents]
+    assert len(names) == len(set(names)) == 25
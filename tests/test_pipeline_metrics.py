@@ -0,0 +1,81 @@
+import json
+
+from pipeline_metrics import PipelineMetrics, percentile
+
+
+def test_percentile_interpolates():
+    assert percentile([4, 1, 3, 2], 0.5) == 2.5
+    assert percentile([1, 2, 3, 4, 5], 0.95) == 4.8
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) == 0.0
+
+
+def test_timed_and_time_record_samples():
+    m = PipelineMetrics()
+
+    @m.timed("clean")
+    def double(x):
+        return x * 2
+
+    assert double(2) == 4
+    with m.time("embed"):
+        pass
+
+    summary = m.summary()
+    assert summary["clean"]["count"] == 1
+    assert summary["embed"]["count"] == 1
+
+
+def test_max_samples_keeps_exact_count_and_sum():
+    m = PipelineMetrics(max_samples=2)
+    for seconds in (1.0, 2.0, 3.0):
+        m.observe("upsert", seconds)
+
+    stats = m.summary()["upsert"]
+    assert stats["count"] == 3
+    assert stats["total"] == 6.0
+    assert m.samples("upsert") == [2.0, 3.0]
+
+
+def test_reset_selected_stages():
+    m = PipelineMetrics()
+    m.observe("embed", 0.1)
+    m.observe("retrieve", 0.2)
+
+    m.reset(stages=["retrieve"])
+    assert list(m.summary()) == ["embed"]
+
+    m.reset()
+    assert m.summary() == {}
+
+
+def test_summary_orders_known_stages_first():
+    m = PipelineMetrics()
+    m.observe("custom", 1.0)
+    m.observe("llm_total", 1.0)
+    m.observe("clean", 1.0)
+    assert list(m.summary()) == ["clean", "llm_total", "custom"]
+
+
+def test_to_json():
+    m = PipelineMetrics()
+    m.observe("chunk", 0.5)
+    exported = json.loads(m.to_json())
+    assert exported["unit"] == "seconds"
+    assert exported["stages"]["chunk"]["p50"] == 0.5
+
+
+def test_to_prometheus():
+    m = PipelineMetrics()
+    m.observe("embed", 0.25)
+    m.observe("embed", 0.75)
+
+    assert m.to_prometheus().splitlines() == [
+        "# HELP cv_rag_stage_duration_seconds Duration of each pipeline stage in seconds.",
+        "# TYPE cv_rag_stage_duration_seconds summary",
+        'cv_rag_stage_duration_seconds{stage="embed",quantile="0.5"} 0.5',
+        'cv_rag_stage_duration_seconds{stage="embed",quantile="0.95"} 0.725',
+        'cv_rag_stage_duration_seconds{stage="embed",quantile="0.99"} 0.745',
+        'cv_rag_stage_duration_seconds_sum{stage="embed"} 1.0',
+        'cv_rag_stage_duration_seconds_count{stage="embed"} 2',
+    ]
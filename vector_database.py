@@ -2,27 +2,35 @@ import os
 from tqdm import tqdm
 from pinecone import Pinecone, ServerlessSpec
 from sentence_transformers import SentenceTransformer
+from pipeline_metrics import metrics
 
 class PineconeDB:
-    def __init__(self, index_name="rag-cvs-named", embedding_dim=1024, region="us-east-1"):
-        # Read API key from environment variable
-        self.api_key = os.getenv("PINECONE_API_KEY")
-        if not self.api_key:
-            raise ValueError("PINECONE_API_KEY environment variable not set.")
-        
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=self.api_key)
+    def __init__(self, index_name="rag-cvs-named", embedding_dim=1024, region="us-east-1",
+                 index=None, model=None):
         self.index_name = index_name
         self.embedding_dim = embedding_dim
-        
-        # Create the index if it doesn't exist
-        self.create_index()
-        
-        # Connect to the index
-        self.index = self.pc.Index(self.index_name)
-        
+
+        if index is None:
+            # Read API key from environment variable
+            self.api_key = os.getenv("PINECONE_API_KEY")
+            if not self.api_key:
+                raise ValueError("PINECONE_API_KEY environment variable not set.")
+
+            # Initialize Pinecone
+            self.pc = Pinecone(api_key=self.api_key)
+
+            # Create the index if it doesn't exist
+            self.create_index()
+
+            # Connect to the index
+            index = self.pc.Index(self.index_name)
+
+        # Any object with a Pinecone-style upsert(vectors=...) works,
+        # which lets the benchmark run against a local stand-in
+        self.index = index
+
         # Initialize the embedding model
-        self.model = SentenceTransformer("BAAI/bge-large-en-v1.5")
+        self.model = model if model is not None else SentenceTransformer("BAAI/bge-large-en-v1.5")
     
     def create_index(self):
         """Creates the Pinecone index if it doesn't already exist."""
@@ -38,16 +46,17 @@ class PineconeDB:
         else:
             print(f"Index '{self.index_name}' already exists.")
     
-    def upload_chunks_to_pinecone(self, chunks):
+    def upload_chunks_to_pinecone(self, chunks, show_progress=True):
         """Uploads chunks to Pinecone."""
         print(f"Starting upload of {len(chunks)} chunks to Pinecone DB.")
         
-        for chunk in tqdm(chunks):
+        for chunk in tqdm(chunks, disable=not show_progress):
             # Use the chunk_id from the chunk itself
             chunk_id = chunk['chunk_id']
             
             # Get the embedding for the chunk content
-            embedding = self.model.encode([chunk['content']])[0]
+            with metrics.time("embed"):
+                embedding = self.model.encode([chunk['content']])[0]
             
             # Prepare metadata
             metadata = {
@@ -57,10 +66,11 @@ class PineconeDB:
             }
             
             # Upload to Pinecone
-            self.index.upsert(vectors=[(
-                chunk_id,
-                embedding.tolist(),  # Convert numpy array to list
-                metadata
-            )])
+            with metrics.time("upsert"):
+                self.index.upsert(vectors=[(
+                    chunk_id,
+                    embedding.tolist(),  # Convert numpy array to list
+                    metadata
+                )])
         
         print("Upload complete!")
\ No newline at end of file